@@ -6,14 +6,17 @@ from pydantic import BaseModel
 from async_queue import AsyncQueue
 from fastapi import FastAPI, APIRouter
 from contextlib import asynccontextmanager
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Set
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 indexer = Indexer()
-async_queue = AsyncQueue()
+async_queue = AsyncQueue(maxsize=indexer.config.INDEX_QUEUE_SIZE)
+# Paths queued or being indexed, so later scans don't queue them again
+in_flight: Set[str] = set()
 router = APIRouter()
 
 class Query(BaseModel):
@@ -57,17 +60,23 @@ async def crawl_loop(queue: AsyncQueue):
             logger.info(f"Starting periodic scan at {scan_start_time}")
             
             # Get list of files that need indexing
-            files_to_index = indexer.get_files_to_index()
+            files_to_index = await asyncio.to_thread(indexer.get_files_to_index)
             
-            # Queue them for indexing
+            # Queue them for indexing, skipping files already queued or running
+            queued = 0
             for file_path in files_to_index:
+                if file_path in in_flight:
+                    continue
+                in_flight.add(file_path)
+                # Waits while the queue is full, so the scan keeps pace with indexing
                 await queue.put({
                     "path": file_path,
                     "scan_time": scan_start_time
                 })
+                queued += 1
                 logger.info(f"Queued file for indexing: {file_path}")
             
-            logger.info(f"Completed scan, found {len(files_to_index)} files to process")
+            logger.info(f"Completed scan, found {len(files_to_index)} files to process, queued {queued}")
             
             # Wait before next scan using configurable interval
             await asyncio.sleep(indexer.config.SCAN_INTERVAL_SECONDS)
@@ -83,11 +92,12 @@ async def index_loop(queue: AsyncQueue, indexer: Indexer):
             # Get next file from queue
             message = await queue.get()
             
-            # Process the file
-            indexer.index(message)
-            
-            # Mark task as done
-            queue.task_done()
+            try:
+                # Process the file off the event loop so queries stay responsive
+                await asyncio.to_thread(indexer.index, message)
+            finally:
+                # Let later scans queue the file again
+                in_flight.discard(message["path"])
             
         except asyncio.CancelledError:
             logger.info("Index loop cancelled")
@@ -98,10 +108,15 @@ async def index_loop(queue: AsyncQueue, indexer: Indexer):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Blocking scan and indexing work runs on the loop's default executor
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=indexer.config.INDEX_THREADS)
+    )
+
     # Always start the indexing tasks - no more START_INDEXING flag
-    tasks = [
-        asyncio.create_task(crawl_loop(async_queue)),
+    tasks = [asyncio.create_task(crawl_loop(async_queue))] + [
         asyncio.create_task(index_loop(async_queue, indexer))
+        for _ in range(indexer.config.INDEX_WORKERS)
     ]
     
     try:
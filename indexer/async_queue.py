@@ -10,9 +10,12 @@ class AsyncQueueDequeueInterrupted(Exception):
 
 class AsyncQueue:
 
-    def __init__(self):
+    def __init__(self, maxsize=0):
         self._data = deque([])
+        self._maxsize = maxsize
         self._presense_of_data = asyncio.Event()
+        self._presense_of_space = asyncio.Event()
+        self._presense_of_space.set()
 
     def enqueue(self, value):
         self._data.append(value)
@@ -26,11 +29,40 @@ class AsyncQueue:
         if len(self._data) < 1:
             raise AsyncQueueDequeueInterrupted("AsyncQueue was dequeue was interrupted")
 
+        return self._take()
+
+    def full(self):
+        return bool(self._maxsize) and len(self._data) >= self._maxsize
+
+    async def put(self, value):
+        """Enqueue, waiting while the queue holds maxsize items"""
+        while self.full():
+            await self._presense_of_space.wait()
+
+        self.enqueue(value)
+
+        if self.full():
+            self._presense_of_space.clear()
+
+    async def get(self):
+        """Wait for the next item; safe to await from several consumers at once"""
+        while not self._data:
+            await self._presense_of_data.wait()
+            # Woken with nothing to take and the event still set: shutdown() was called
+            if not self._data and self._presense_of_data.is_set():
+                raise AsyncQueueDequeueInterrupted("AsyncQueue get was interrupted")
+
+        return self._take()
+
+    def _take(self):
         result = self._data.popleft()
 
         if not self._data:
             self._presense_of_data.clear()
 
+        if not self.full():
+            self._presense_of_space.set()
+
         return result
 
     def size(self):
@@ -0,0 +1,116 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, Tuple
+
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+from langchain.schema import Document
+from langchain_qdrant import QdrantVectorStore
+from langchain_huggingface import HuggingFaceEmbeddings
+
+logger = logging.getLogger(__name__)
+
+EmbeddingRequest = Tuple[List[Document], List[str], Future]
+
+
+class EmbeddingBatcher:
+    """
+    Collects chunks from concurrently indexed files and embeds them together,
+    so the embedding model sees a few large batches instead of many small ones
+    """
+
+    def __init__(
+        self,
+        qdrant: QdrantClient,
+        embed_model: HuggingFaceEmbeddings,
+        collection_name: str,
+        batch_size: int = 128,
+        flush_interval_ms: int = 50
+    ):
+        self.qdrant = qdrant
+        self.embed_model = embed_model
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._requests: Deque[EmbeddingRequest] = deque()
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(
+            target=self._run,
+            name="embedding-batcher",
+            daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, documents: List[Document], ids: List[str]) -> Future:
+        """Queue one file's chunks for embedding; the future resolves to their stored IDs"""
+        future = Future()
+        with self._condition:
+            self._requests.append((documents, ids, future))
+            self._condition.notify()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._store(batch)
+            except Exception as e:
+                logger.error(f"Error embedding batch of {len(batch)} files: {e}")
+                if len(batch) == 1:
+                    batch[0][2].set_exception(e)
+                    continue
+                # Retry file by file so one bad file does not fail the rest
+                for request in batch:
+                    try:
+                        self._store([request])
+                    except Exception as file_error:
+                        request[2].set_exception(file_error)
+
+    def _next_batch(self) -> List[EmbeddingRequest]:
+        """Wait for work, then gather whole files until batch_size chunks or the flush interval"""
+        with self._condition:
+            while not self._requests:
+                self._condition.wait()
+
+            deadline = time.monotonic() + self.flush_interval
+            batch = [self._requests.popleft()]
+            chunk_count = len(batch[0][0])
+            while chunk_count < self.batch_size:
+                if not self._requests:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                    continue
+                request = self._requests.popleft()
+                batch.append(request)
+                chunk_count += len(request[0])
+            return batch
+
+    def _store(self, batch: List[EmbeddingRequest]) -> None:
+        documents = [doc for docs, _, _ in batch for doc in docs]
+        ids = [doc_id for _, doc_ids, _ in batch for doc_id in doc_ids]
+        vectors = self.embed_model.embed_documents([doc.page_content for doc in documents])
+        # Payload layout matches what QdrantVectorStore reads back in searches
+        points = [
+            PointStruct(
+                id=doc_id,
+                vector=vector,
+                payload={
+                    QdrantVectorStore.CONTENT_KEY: doc.page_content,
+                    QdrantVectorStore.METADATA_KEY: doc.metadata,
+                }
+            )
+            for doc_id, vector, doc in zip(ids, vectors, documents)
+        ]
+        self.qdrant.upload_points(
+            collection_name=self.collection_name,
+            points=points,
+            batch_size=self.batch_size,
+            wait=True
+        )
+        for _, doc_ids, future in batch:
+            future.set_result(doc_ids)
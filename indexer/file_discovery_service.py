@@ -1,23 +1,40 @@
 import os
+import re
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Set, Dict
+from typing import List, Optional, Set, Dict, Tuple
 from .indexing_types import FileStatus, IndexingStatus
 from .index_status_tracker import IndexStatusTracker
 
 logger = logging.getLogger(__name__)
 
+# Where supported (Linux), directories are scanned through an open fd so that
+# DirEntry.stat() becomes fstatat() relative to it instead of a full path lookup
+_SCAN_BY_DIR_FD = (
+    hasattr(os, 'O_DIRECTORY')
+    and os.scandir in os.supports_fd
+    and os.stat in os.supports_dir_fd
+)
+
 class FileDiscoveryService:
     def __init__(
         self,
         status_tracker: IndexStatusTracker,
         supported_extensions: Set[str],
-        base_directory: str
+        base_directory: str,
+        scan_concurrency: int = 8
     ):
         self.status_tracker = status_tracker
-        self.supported_extensions = supported_extensions
+        self.supported_extensions = frozenset(ext.lower() for ext in supported_extensions)
+        # Extensions include the dot, so a match can only start this far from the end
+        self._max_extension_length = max(map(len, self.supported_extensions), default=0)
+        self._extension_pattern = re.compile(
+            r'\.(?:' + '|'.join(re.escape(ext.lstrip('.')) for ext in sorted(self.supported_extensions)) + r')\Z',
+            re.IGNORECASE
+        )
         self.base_directory = Path(base_directory)
+        self.scan_concurrency = scan_concurrency
 
     def scan_directory(self) -> List[FileStatus]:
         """
@@ -32,7 +49,7 @@ class FileDiscoveryService:
             self._update_existing_files(current_files)
             
             # Mark files that no longer exist
-            self.status_tracker.mark_deleted_files(current_files)
+            self.status_tracker.mark_deleted_files([path for path, _ in current_files])
             
             # Get list of files that need indexing
             return self.status_tracker.get_files_needing_indexing()
@@ -40,53 +57,107 @@ class FileDiscoveryService:
         except Exception as e:
             logger.error(f"Error scanning directory: {e}")
             return []
+        finally:
+            # Persist all status changes from this scan in a single write
+            self.status_tracker.flush()
 
-    def _get_current_files(self) -> List[str]:
-        """Get all supported files in the directory"""
+    def _get_current_files(self) -> List[Tuple[str, os.stat_result]]:
+        """Get all supported files in the directory along with their stat results"""
         current_files = []
-        for root, _, files in os.walk(self.base_directory):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in self.supported_extensions:
-                    current_files.append(str(file_path))
+        with ThreadPoolExecutor(max_workers=self.scan_concurrency) as executor:
+            # Each subdirectory is listed by its own task so stat latency overlaps
+            pending = {executor.submit(self._scan_single_directory, str(self.base_directory))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories = future.result()
+                    current_files.extend(files)
+                    pending.update(
+                        executor.submit(self._scan_single_directory, subdirectory)
+                        for subdirectory in subdirectories
+                    )
         return current_files
 
-    def _update_existing_files(self, current_files: List[str]) -> None:
-        """Update status for all existing files"""
-        for file_path in current_files:
-            self._process_file(file_path)
+    def _scan_single_directory(
+        self,
+        directory: str
+    ) -> Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+        """List one directory, returning its supported files with stat results and its subdirectories"""
+        files = []
+        subdirectories = []
+        dir_fd = None
+        try:
+            if _SCAN_BY_DIR_FD:
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            with os.scandir(directory if dir_fd is None else dir_fd) as entries:
+                for entry in entries:
+                    # Entries from an fd scan carry only their name
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(os.path.join(directory, name))
+                    elif entry.is_file():
+                        if self._extension_pattern.search(name, max(0, len(name) - self._max_extension_length)):
+                            path = os.path.join(directory, name)
+                            try:
+                                files.append((path, entry.stat()))
+                            except OSError as e:
+                                logger.error(f"Error reading file {path}: {e}")
+        except OSError as e:
+            logger.error(f"Error scanning directory {directory}: {e}")
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        return files, subdirectories
 
-    def _process_file(self, file_path: str) -> None:
-        """Process a single file and update its status if necessary"""
+    def _update_existing_files(self, current_files: List[Tuple[str, os.stat_result]]) -> None:
+        """Update status for all existing files, applying the changes as one batch"""
+        new_files: Dict[str, float] = {}
+        updates: Dict[str, Tuple[IndexingStatus, Optional[str]]] = {}
+        modified_times: Dict[str, float] = {}
+        for file_path, st in current_files:
+            self._process_file(file_path, st, new_files, updates, modified_times)
+        self.status_tracker.add_pending_files(new_files)
+        self.status_tracker.update_file_statuses(updates, modified_times)
+
+    def _process_file(
+        self,
+        file_path: str,
+        st: os.stat_result,
+        new_files: Dict[str, float],
+        updates: Dict[str, Tuple[IndexingStatus, Optional[str]]],
+        modified_times: Dict[str, float]
+    ) -> None:
+        """Work out whether a single file's status needs to change, recording it in new_files or updates"""
+        existing_status = None
         try:
-            path = Path(file_path)
-            current_modified_time = datetime.fromtimestamp(path.stat().st_mtime)
+            current_modified_time = st.st_mtime
             
             # Get existing status
             existing_status = self.status_tracker.get_file_status(file_path)
             
             if existing_status is None:
                 # New file - add to tracking
-                self.status_tracker.add_pending_file(file_path)
+                new_files[file_path] = current_modified_time
                 logger.info(f"Added new file to tracking: {file_path}")
                 
             elif existing_status.indexing_status == IndexingStatus.COMPLETE:
                 # Check if file has been modified since last indexing
                 if current_modified_time > existing_status.last_modified_time:
-                    self.status_tracker.update_file_status(
-                        file_path,
+                    updates[file_path] = (
                         IndexingStatus.PENDING,
                         "File modified since last indexing"
                     )
+                    # Remember the new mtime so the file is not re-queued on every scan
+                    modified_times[file_path] = current_modified_time
                     logger.info(f"Marked modified file for re-indexing: {file_path}")
                     
             elif existing_status.indexing_status == IndexingStatus.DELETED_FROM_STORE:
                 # File exists again - mark for re-indexing
-                self.status_tracker.update_file_status(
-                    file_path,
+                updates[file_path] = (
                     IndexingStatus.PENDING,
                     "File restored - needs re-indexing"
                 )
+                modified_times[file_path] = current_modified_time
                 logger.info(f"Marked restored file for re-indexing: {file_path}")
                 
             # Note: We don't change status for RUNNING, PENDING, or FAILED files
@@ -94,8 +165,7 @@ class FileDiscoveryService:
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
             if existing_status:
-                self.status_tracker.update_file_status(
-                    file_path,
+                updates[file_path] = (
                     IndexingStatus.FAILED,
                     f"Error during file processing: {str(e)}"
-                )
\ No newline at end of file
+                )
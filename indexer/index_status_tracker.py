@@ -1,82 +1,235 @@
 import os
 import csv
+import mmap
+import time
 import logging
 import shutil
-from datetime import datetime
+import orjson
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from threading import Lock
 from .indexing_types import FileStatus, IndexingStatus
 
 logger = logging.getLogger(__name__)
 
+# Status keys are normalized paths; normpath avoids building a Path per lookup
+_norm = os.path.normpath
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy src to dst, letting the kernel clone extents on filesystems that support it"""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
 class IndexStatusTracker:
-    def __init__(self, status_file_path: str = "index_status.csv"):
+    # Compact once the journal outgrows the snapshot by this factor
+    JOURNAL_COMPACTION_RATIO = 10
+    JOURNAL_COMPACTION_MIN_BYTES = 1024 * 1024
+
+    def __init__(self, status_file_path: str = "index_status.json"):
         self.status_file_path = Path(status_file_path)
+        self.journal_path = self.status_file_path.with_suffix('.journal')
+        # Serializes writers and readers that iterate; single-path lookups skip it,
+        # since records are replaced rather than mutated and a dict store is atomic
         self.status_lock = Lock()
-        self.statuses: Dict[str, FileStatus] = {}
+        self._statuses: Dict[str, FileStatus] = {}
+        # Paths grouped by status, kept in step with _statuses
+        self._by_status: Dict[IndexingStatus, Set[str]] = {s: set() for s in IndexingStatus}
+        self._pending: Dict[str, FileStatus] = {}
+        self._backup_is_current = False
         self._ensure_status_file_exists()
         self._load_status_file()
+        self._journal = open(self.journal_path, 'ab')
+        # Fold any journal left by the previous run into a fresh snapshot
+        if self._journal.tell() > 0:
+            self._compact()
 
     def _ensure_status_file_exists(self) -> None:
         """Create the status file if it doesn't exist"""
         if not self.status_file_path.exists():
             self.status_file_path.parent.mkdir(parents=True, exist_ok=True)
-            self._save_status_file({})  # Create empty status file
+            self._save_status_file(self._load_legacy_csv())
+
+    def _load_legacy_csv(self) -> Dict[str, FileStatus]:
+        """Read statuses from the CSV status file used by earlier versions, if present"""
+        legacy_path = self.status_file_path.with_suffix('.csv')
+        if not legacy_path.exists():
+            return {}
+
+        try:
+            with open(legacy_path, 'r', newline='') as f:
+                statuses = {
+                    row['relative_path']: FileStatus.from_dict(row)
+                    for row in csv.DictReader(f)
+                }
+            logger.info(f"Migrated {len(statuses)} statuses from {legacy_path}")
+            return statuses
+        except Exception as e:
+            logger.error(f"Error migrating legacy status file: {e}")
+            return {}
 
     def _create_backup(self) -> None:
-        """Create a backup of the current status file"""
+        """Create a backup of the current status file unless it is already backed up"""
+        if self._backup_is_current:
+            return
         if self.status_file_path.exists():
-            backup_path = self.status_file_path.with_suffix('.csv.backup')
-            shutil.copy2(self.status_file_path, backup_path)
+            backup_path = self.status_file_path.with_suffix('.json.backup')
+            if backup_path.exists():
+                backup_path.unlink()
+            try:
+                # Snapshots are replaced, never rewritten in place, so a hard link
+                # keeps the old contents without copying a byte
+                os.link(self.status_file_path, backup_path)
+            except OSError:
+                _copy_file(self.status_file_path, backup_path)
+            self._backup_is_current = True
 
     def _load_status_file(self) -> None:
-        """Load the status file into memory"""
+        """Load the status snapshot into memory and replay the journal on top of it"""
         if not self.status_file_path.exists():
             return
 
         try:
-            with open(self.status_file_path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                self.statuses = {
+            with open(self.status_file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                # orjson parses straight from the mapping, skipping a read() copy
+                statuses = {
                     row['relative_path']: FileStatus.from_dict(row)
-                    for row in reader
+                    for row in orjson.loads(view)
                 }
         except Exception as e:
             logger.error(f"Error loading status file: {e}")
             # If loading fails, try to restore from backup
             self._restore_from_backup()
+            return
+
+        self._replay_journal(statuses)
+        self._publish_loaded(statuses)
 
-    def _save_status_file(self, statuses: Dict[str, FileStatus]) -> None:
-        """Save the status dictionary to the CSV file"""
+    def _replay_journal(self, statuses: Dict[str, FileStatus]) -> None:
+        """Apply journaled status changes recorded since the last snapshot"""
+        if not self.journal_path.exists() or self.journal_path.stat().st_size == 0:
+            return
+
+        with open(self.journal_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            size = len(mm)
+            while pos < size:
+                end = mm.find(b'\n', pos)
+                if end == -1:
+                    end = size
+                try:
+                    row = orjson.loads(mm[pos:end])
+                    statuses[row['relative_path']] = FileStatus.from_dict(row)
+                except Exception as e:
+                    # A torn final record from an interrupted write
+                    logger.warning(f"Skipping unreadable journal record: {e}")
+                pos = end + 1
+
+    def _save_status_file(self, statuses: Dict[str, FileStatus]) -> bool:
+        """Atomically replace the JSON snapshot with the given statuses"""
+        tmp_path = self.status_file_path.with_suffix('.json.tmp')
         try:
             self._create_backup()
-            fieldnames = [
-                'filename', 'file_extension', 'relative_path',
-                'indexing_status', 'last_modified_time',
-                'last_indexed_time', 'error_message'
-            ]
-            
-            with open(self.status_file_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for status in statuses.values():
-                    writer.writerow(status.to_dict())
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(list(statuses.values())))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.status_file_path)
+            self._backup_is_current = False
+            return True
         except Exception as e:
             logger.error(f"Error saving status file: {e}")
-            self._restore_from_backup()
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
+
+    def _needs_compaction(self) -> bool:
+        snapshot_size = self.status_file_path.stat().st_size
+        threshold = max(
+            snapshot_size * self.JOURNAL_COMPACTION_RATIO,
+            self.JOURNAL_COMPACTION_MIN_BYTES
+        )
+        return self._journal.tell() > threshold
+
+    def compact(self) -> None:
+        """Rewrite the snapshot from memory and truncate the journal"""
+        with self.status_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        # Only drop the journal once its records are safely in the snapshot
+        if self._save_status_file(self.statuses):
+            self._journal.seek(0)
+            self._journal.truncate()
+
+    def flush(self) -> None:
+        """Append pending status changes to the journal, compacting it when it grows too large"""
+        with self.status_lock:
+            if not self._pending:
+                return
+            try:
+                self._journal.write(b''.join(
+                    orjson.dumps(status, option=orjson.OPT_APPEND_NEWLINE)
+                    for status in self._pending.values()
+                ))
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._pending.clear()
+                if self._needs_compaction():
+                    self._compact()
+            except Exception as e:
+                logger.error(f"Error writing status journal: {e}")
 
     def _restore_from_backup(self) -> None:
         """Attempt to restore the status file from backup"""
-        backup_path = self.status_file_path.with_suffix('.csv.backup')
+        backup_path = self.status_file_path.with_suffix('.json.backup')
         if backup_path.exists():
-            shutil.copy2(backup_path, self.status_file_path)
+            _copy_file(backup_path, self.status_file_path)
             self._load_status_file()
 
+    def _publish_loaded(self, statuses: Dict[str, FileStatus]) -> None:
+        """Install freshly loaded statuses, grouping their paths by status"""
+        by_status: Dict[IndexingStatus, Set[str]] = {s: set() for s in IndexingStatus}
+        for path_str, file_status in statuses.items():
+            by_status[file_status.indexing_status].add(path_str)
+        self._statuses = statuses
+        self._by_status = by_status
+
+    def _apply(self, changes: Dict[str, FileStatus]) -> None:
+        """Store the changed records in place; the caller holds status_lock"""
+        statuses, by_status = self._statuses, self._by_status
+        for path_str, file_status in changes.items():
+            previous = statuses.get(path_str)
+            if previous is not None and previous.indexing_status is not file_status.indexing_status:
+                by_status[previous.indexing_status].discard(path_str)
+            by_status[file_status.indexing_status].add(path_str)
+            statuses[path_str] = file_status
+        self._pending.update(changes)
+
+    @property
+    def statuses(self) -> Dict[str, FileStatus]:
+        """All tracked statuses keyed by path; treat as read-only and iterate under status_lock"""
+        return self._statuses
+
     def get_file_status(self, filepath: str) -> Optional[FileStatus]:
         """Get the status of a specific file"""
-        with self.status_lock:
-            return self.statuses.get(str(Path(filepath)))
+        return self._statuses.get(_norm(filepath))
 
     def update_file_status(
         self,
@@ -85,50 +238,86 @@ class IndexStatusTracker:
         error_message: Optional[str] = None
     ) -> None:
         """Update the status of a specific file"""
+        self.update_file_statuses({filepath: (status, error_message)})
+
+    def update_file_statuses(
+        self,
+        updates: Dict[str, Tuple[IndexingStatus, Optional[str]]],
+        modified_times: Optional[Dict[str, float]] = None
+    ) -> None:
+        """
+        Update the status and error message of several files under one lock,
+        recording new modification times for files listed in modified_times
+        """
+        now = time.time()
+        modified_times = modified_times or {}
         with self.status_lock:
-            path_str = str(Path(filepath))
-            if path_str in self.statuses:
-                file_status = self.statuses[path_str]
-                file_status.indexing_status = status
-                file_status.error_message = error_message
-                if status == IndexingStatus.COMPLETE:
-                    file_status.last_indexed_time = datetime.now()
-                self._save_status_file(self.statuses)
-
-    def add_pending_file(self, filepath: str) -> None:
-        """Add a new file with PENDING status"""
-        path = Path(filepath)
-        with self.status_lock:
-            if str(path) not in self.statuses:
-                modified_time = datetime.fromtimestamp(path.stat().st_mtime)
-                self.statuses[str(path)] = FileStatus.create_pending(
-                    filepath=str(path),
-                    modified_time=modified_time
+            statuses = self._statuses
+            changes = {}
+            for filepath, (status, error_message) in updates.items():
+                path_str = _norm(filepath)
+                file_status = statuses.get(path_str)
+                if file_status is None:
+                    continue
+                changes[path_str] = replace(
+                    file_status,
+                    indexing_status=status,
+                    error_message=error_message,
+                    last_modified_time=modified_times.get(filepath, file_status.last_modified_time),
+                    last_indexed_time=now if status == IndexingStatus.COMPLETE else file_status.last_indexed_time
                 )
-                self._save_status_file(self.statuses)
+            self._apply(changes)
+
+    def add_pending_file(self, filepath: str, modified_time: Optional[float] = None) -> None:
+        """Add a new file with PENDING status, reusing modified_time when the caller already has it"""
+        path_str = _norm(filepath)
+        if path_str in self._statuses:
+            return
+        if modified_time is None:
+            modified_time = os.stat(path_str).st_mtime
+        self.add_pending_files({path_str: modified_time})
+
+    def add_pending_files(self, files: Dict[str, float]) -> None:
+        """Add new files, given with their modification times, with PENDING status"""
+        with self.status_lock:
+            statuses = self._statuses
+            changes = {}
+            for filepath, modified_time in files.items():
+                path_str = _norm(filepath)
+                if path_str not in statuses:
+                    changes[path_str] = FileStatus.create_pending(
+                        filepath=path_str,
+                        modified_time=modified_time
+                    )
+            self._apply(changes)
 
     def mark_deleted_files(self, existing_files: List[str]) -> None:
         """Mark files that no longer exist as DELETED_FROM_STORE"""
-        existing_paths = {str(Path(f)) for f in existing_files}
+        existing_paths = set(map(_norm, existing_files))
         with self.status_lock:
-            for path_str, status in self.statuses.items():
-                if path_str not in existing_paths and status.indexing_status != IndexingStatus.DELETED_FROM_STORE:
-                    status.indexing_status = IndexingStatus.DELETED_FROM_STORE
-                    status.error_message = "File no longer exists"
-            self._save_status_file(self.statuses)
+            statuses, by_status = self._statuses, self._by_status
+            # Set difference runs in C; only files that actually vanished are visited
+            to_mark = statuses.keys() - existing_paths - by_status[IndexingStatus.DELETED_FROM_STORE]
+            changes = {
+                path_str: replace(
+                    statuses[path_str],
+                    indexing_status=IndexingStatus.DELETED_FROM_STORE,
+                    error_message="File no longer exists"
+                )
+                for path_str in to_mark
+            }
+            self._apply(changes)
 
     def get_files_by_status(self, status: IndexingStatus) -> List[FileStatus]:
         """Get all files with a specific status"""
         with self.status_lock:
-            return [
-                file_status for file_status in self.statuses.values()
-                if file_status.indexing_status == status
-            ]
+            return [self._statuses[path_str] for path_str in self._by_status[status]]
 
     def get_files_needing_indexing(self) -> List[FileStatus]:
         """Get all files that need to be indexed (PENDING or FAILED status)"""
         with self.status_lock:
+            statuses, by_status = self._statuses, self._by_status
             return [
-                file_status for file_status in self.statuses.values()
-                if file_status.indexing_status in (IndexingStatus.PENDING, IndexingStatus.FAILED)
-            ]
\ No newline at end of file
+                statuses[path_str]
+                for path_str in by_status[IndexingStatus.PENDING] | by_status[IndexingStatus.FAILED]
+            ]
@@ -2,16 +2,22 @@ import os
 import uuid
 import torch
 import logging
+import functools
 from dataclasses import dataclass
 from typing import List, Set, Dict, Optional
-from pathlib import Path
 from datetime import datetime
 
 from qdrant_client import QdrantClient
 from langchain_qdrant import QdrantVectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
-from qdrant_client.http.models import Distance, VectorParams
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from qdrant_client.http.models import (
+    Distance,
+    VectorParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+)
+from langchain.text_splitter import TokenTextSplitter
 from langchain.schema import Document
 from langchain_community.document_loaders import (
     TextLoader,
@@ -24,6 +30,7 @@ from langchain_community.document_loaders import (
 from .indexing_types import IndexingStatus
 from .index_status_tracker import IndexStatusTracker
 from .file_discovery_service import FileDiscoveryService
+from .embedding_batcher import EmbeddingBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -51,13 +58,33 @@ class Config:
     QDRANT_BOOTSTRAP = "qdrant"
     EMBEDDING_MODEL_ID = os.environ.get("EMBEDDING_MODEL_ID")
     EMBEDDING_SIZE = os.environ.get("EMBEDDING_SIZE")
+    # Opt-in reduced precision: "float16" (cuda/mps), "int8" (cpu), or "auto" for
+    # float16 on cuda/mps and int8 on cpu. Changing it requires re-indexing existing files.
+    EMBEDDING_PRECISION = os.environ.get("EMBEDDING_PRECISION", "float32")
+    EMBEDDING_PRECISIONS = ("float32", "float16", "int8", "auto")
     
-    # Scanning configuration
+    # Scanning configuration; compose passes unset tuning variables through
+    # as empty strings, which fall back to the defaults below
     SCAN_INTERVAL_MINUTES = int(os.environ.get("SCAN_INTERVAL_MINUTES", 5))
     SCAN_INTERVAL_SECONDS = SCAN_INTERVAL_MINUTES * 60
+    SCAN_CONCURRENCY = int(os.environ.get("SCAN_CONCURRENCY") or 8)
+    INDEX_WORKERS = int(os.environ.get("INDEX_WORKERS") or os.cpu_count() or 1)
+    # One thread per index worker plus one for the periodic scan
+    INDEX_THREADS = int(os.environ.get("INDEX_THREADS") or INDEX_WORKERS + 1)
+    INDEX_QUEUE_SIZE = int(os.environ.get("INDEX_QUEUE_SIZE") or 1024)
     
-    CHUNK_SIZE = 500
-    CHUNK_OVERLAP = 200
+    # Measured in tiktoken tokens (~4 characters each), roughly the previous
+    # 500/200 character chunks
+    CHUNK_ENCODING = "cl100k_base"
+    CHUNK_SIZE = 125
+    CHUNK_OVERLAP = 50
+
+    # Chunks from concurrently indexed files are embedded together
+    EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE") or 128)
+    EMBEDDING_FLUSH_INTERVAL_MS = int(os.environ.get("EMBEDDING_FLUSH_INTERVAL_MS") or 50)
+
+    # Query embeddings kept for repeated searches
+    QUERY_CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE") or 4096)
 
 
 class Indexer:
@@ -65,7 +92,17 @@ class Indexer:
         self.config = Config()
         self.qdrant = self._initialize_qdrant()
         self.embed_model = self._initialize_embeddings()
+        self._embed_query = functools.lru_cache(maxsize=self.config.QUERY_CACHE_SIZE)(
+            self.embed_model.embed_query
+        )
         self.document_store = self._setup_collection()
+        self.embedding_batcher = EmbeddingBatcher(
+            qdrant=self.qdrant,
+            embed_model=self.embed_model,
+            collection_name=self.config.QDRANT_COLLECTION,
+            batch_size=self.config.EMBEDDING_BATCH_SIZE,
+            flush_interval_ms=self.config.EMBEDDING_FLUSH_INTERVAL_MS
+        )
         self.text_splitter = self._initialize_text_splitter()
         
         # Initialize status tracking
@@ -73,25 +110,78 @@ class Indexer:
         self.file_discovery = FileDiscoveryService(
             status_tracker=self.status_tracker,
             supported_extensions=set(self.config.EXTENSIONS_TO_LOADERS.keys()),
-            base_directory=self.config.LOCAL_FILES_PATH
+            base_directory=self.config.LOCAL_FILES_PATH,
+            scan_concurrency=self.config.SCAN_CONCURRENCY
         )
 
     def _initialize_qdrant(self) -> QdrantClient:
         return QdrantClient(host=self.config.QDRANT_BOOTSTRAP)
 
+    def _embedding_precision(self) -> str:
+        precision = self.config.EMBEDDING_PRECISION
+        if precision not in self.config.EMBEDDING_PRECISIONS:
+            raise ValueError(
+                f"Unsupported EMBEDDING_PRECISION: {precision!r}, "
+                f"expected one of {', '.join(self.config.EMBEDDING_PRECISIONS)}"
+            )
+        device = self.config.DEVICE.type
+        if precision == "auto":
+            return "int8" if device == "cpu" else "float16"
+        # Dynamic quantization only has CPU kernels, and torch has no float16 CPU
+        # kernels for the model's ops, so both fail at the first encode
+        if precision == "int8" and device != "cpu":
+            raise ValueError(f"EMBEDDING_PRECISION=int8 requires a cpu device, got {device}")
+        if precision == "float16" and device == "cpu":
+            raise ValueError("EMBEDDING_PRECISION=float16 requires a cuda or mps device")
+        return precision
+
     def _initialize_embeddings(self) -> HuggingFaceEmbeddings:
-        return HuggingFaceEmbeddings(
+        precision = self._embedding_precision()
+        embeddings = HuggingFaceEmbeddings(
             model_name=self.config.EMBEDDING_MODEL_ID,
             model_kwargs={'device': self.config.DEVICE},
-            encode_kwargs={'normalize_embeddings': False}
+            encode_kwargs={
+                'normalize_embeddings': False,
+                'batch_size': self.config.EMBEDDING_BATCH_SIZE
+            }
         )
 
-    def _initialize_text_splitter(self) -> RecursiveCharacterTextSplitter:
-        return RecursiveCharacterTextSplitter(
+        # Cast after loading: sentence-transformers 2.6.0 takes no model_kwargs/torch_dtype
+        model = getattr(embeddings, '_client', None) or embeddings.client
+        if precision == "float16":
+            model.half()
+        elif precision == "int8":
+            # Dynamic quantization keeps Linear weights in int8 and runs int8 matmuls on CPU
+            torch.quantization.quantize_dynamic(
+                model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+                inplace=True
+            )
+
+        logger.info(f"Loaded embedding model {self.config.EMBEDDING_MODEL_ID} with {precision} precision")
+        return embeddings
+
+    def _initialize_text_splitter(self) -> TokenTextSplitter:
+        # Encodes each document once in tiktoken's native code and slices the token ids
+        return TokenTextSplitter(
+            encoding_name=self.config.CHUNK_ENCODING,
             chunk_size=self.config.CHUNK_SIZE,
             chunk_overlap=self.config.CHUNK_OVERLAP
         )
 
+    def _quantization_config(self) -> Optional[ScalarQuantization]:
+        # Full precision models keep exact search; reduced precision ones also
+        # search on int8 copies of the vectors held in RAM
+        if self._embedding_precision() == "float32":
+            return None
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                always_ram=True
+            )
+        )
+
     def _setup_collection(self) -> QdrantVectorStore:
         if not self.qdrant.collection_exists(self.config.QDRANT_COLLECTION):
             self.qdrant.create_collection(
@@ -100,6 +190,7 @@ class Indexer:
                     size=self.config.EMBEDDING_SIZE,
                     distance=Distance.COSINE
                 ),
+                quantization_config=self._quantization_config(),
             )
         return QdrantVectorStore(
             client=self.qdrant,
@@ -108,7 +199,7 @@ class Indexer:
         )
 
     def _create_loader(self, file_path: str):
-        file_extension = Path(file_path).suffix.lower()
+        file_extension = os.path.splitext(file_path)[1].lower()
         loader_class = self.config.EXTENSIONS_TO_LOADERS.get(file_extension)
         
         if not loader_class:
@@ -126,8 +217,8 @@ class Indexer:
             for doc in documents:
                 doc.metadata['file_path'] = loader.file_path
 
-            uuids = [str(uuid.uuid4()) for _ in range(len(documents))]
-            ids = self.document_store.add_documents(documents=documents, ids=uuids)
+            uuids = [uuid.uuid4().hex for _ in range(len(documents))]
+            ids = self.embedding_batcher.submit(documents, uuids).result()
             
             logger.info(f"Successfully processed {len(ids)} documents from {loader.file_path}")
             return ids
@@ -179,11 +270,13 @@ class Indexer:
                 IndexingStatus.FAILED,
                 error_msg
             )
+        finally:
+            self.status_tracker.flush()
 
     def find(self, query: str) -> Dict[str, any]:
         try:
             logger.info(f"Searching for: {query}")
-            found = self.document_store.search(query, search_type="similarity")
+            found = self.document_store.similarity_search_by_vector(self.embed(query))
             
             if not found:
                 logger.info("No results found")
@@ -213,4 +306,5 @@ class Indexer:
             return {"error": "Unable to find anything for the given query"}
 
     def embed(self, query: str):
-        return self.embed_model.embed_query(query)
\ No newline at end of file
+        # Copy so callers cannot mutate the cached vector
+        return list(self._embed_query(query))
\ No newline at end of file
@@ -1,9 +1,19 @@
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
 from typing import Optional
 
 
+def _to_timestamp(value) -> Optional[float]:
+    """Read a stored time as a Unix timestamp, accepting ISO strings from older status files"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
 class IndexingStatus(Enum):
     PENDING = "PENDING"
     RUNNING = "RUNNING"
@@ -14,56 +24,48 @@ class IndexingStatus(Enum):
 
 @dataclass
 class FileStatus:
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        'filename', 'file_extension', 'relative_path', 'indexing_status',
+        'last_modified_time', 'last_indexed_time', 'error_message'
+    )
+
     filename: str
     file_extension: str
     relative_path: str
     indexing_status: IndexingStatus
-    last_modified_time: datetime
-    last_indexed_time: Optional[datetime]
+    # Unix timestamps, compared directly against os.stat_result.st_mtime
+    last_modified_time: float
+    last_indexed_time: Optional[float]
     error_message: Optional[str]
 
     @classmethod
-    def create_pending(cls, filepath: str, modified_time: datetime) -> 'FileStatus':
+    def create_pending(cls, filepath: str, modified_time: float) -> 'FileStatus':
         """
         Create a new FileStatus instance with PENDING status
         """
-        from pathlib import Path
-        path = Path(filepath)
+        filename = os.path.basename(filepath)
         return cls(
-            filename=path.name,
-            file_extension=path.suffix.lower(),
-            relative_path=str(path),
+            filename=filename,
+            file_extension=os.path.splitext(filename)[1].lower(),
+            relative_path=filepath,
             indexing_status=IndexingStatus.PENDING,
             last_modified_time=modified_time,
             last_indexed_time=None,
             error_message=None
         )
 
-    def to_dict(self) -> dict:
-        """
-        Convert the FileStatus instance to a dictionary for CSV storage
-        """
-        return {
-            'filename': self.filename,
-            'file_extension': self.file_extension,
-            'relative_path': self.relative_path,
-            'indexing_status': self.indexing_status.value,
-            'last_modified_time': self.last_modified_time.isoformat(),
-            'last_indexed_time': self.last_indexed_time.isoformat() if self.last_indexed_time else None,
-            'error_message': self.error_message
-        }
-
     @classmethod
     def from_dict(cls, data: dict) -> 'FileStatus':
         """
-        Create a FileStatus instance from a dictionary (loaded from CSV)
+        Create a FileStatus instance from a dictionary (loaded from the status store)
         """
         return cls(
             filename=data['filename'],
             file_extension=data['file_extension'],
             relative_path=data['relative_path'],
             indexing_status=IndexingStatus(data['indexing_status']),
-            last_modified_time=datetime.fromisoformat(data['last_modified_time']),
-            last_indexed_time=datetime.fromisoformat(data['last_indexed_time']) if data['last_indexed_time'] else None,
+            last_modified_time=_to_timestamp(data['last_modified_time']),
+            last_indexed_time=_to_timestamp(data['last_indexed_time']),
             error_message=data['error_message']
         )
\ No newline at end of file